@@ -195,6 +195,13 @@ func init() {
 // (if do it synchronously, and can't resolve URL, this blocks caller for ever)
 func beginDetectNewVersion() chan struct{} {
 	completionChannel := make(chan struct{})
+
+	// the check can be turned off, so that callers waiting on it (e.g. the login command) return right away
+	if strings.ToLower(glcm.GetEnvironmentVariable(common.EEnvironmentVariable.SkipVersionCheck())) == "true" {
+		close(completionChannel)
+		return completionChannel
+	}
+
 	go func() {
 		const versionMetadataUrl = "https://aka.ms/azcopyv10-version-metadata"
 
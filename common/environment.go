@@ -70,6 +70,7 @@ var VisibleEnvironmentVariables = []EnvironmentVariable{
 	EEnvironmentVariable.CPKEncryptionKeySHA256(),
 	EEnvironmentVariable.DisableSyslog(),
 	EEnvironmentVariable.MimeMapping(),
+	EEnvironmentVariable.SkipVersionCheck(),
 }
 
 var EEnvironmentVariable = EnvironmentVariable{}
@@ -361,3 +362,12 @@ func (EnvironmentVariable) MimeMapping() EnvironmentVariable {
 		Description: "Location of the file to override default OS mime mapping",
 	}
 }
+
+func (EnvironmentVariable) SkipVersionCheck() EnvironmentVariable {
+	return EnvironmentVariable{
+		Name:         "AZCOPY_SKIP_VERSION_CHECK",
+		DefaultValue: "false",
+		Description: "Skips checking whether a newer version of AzCopy is available. " +
+			"Consider setting this environment variable to true when AzCopy is invoked many times in a row by automation, such as test suites.",
+	}
+}
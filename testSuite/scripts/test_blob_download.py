@@ -4,7 +4,7 @@ import shutil
 import time
 import urllib
 import urllib.parse as urlparse
-from collections import namedtuple
+from types import SimpleNamespace
 import utility as util
 import unittest
 
@@ -309,7 +309,7 @@ class Blob_Download_User_Scenario(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         # since the wildcards '*' exists at the end of dir_name in the sas
@@ -329,7 +329,7 @@ class Blob_Download_User_Scenario(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         # since the wildcards '*/*.txt' exists at the end of dir_name in the sas
@@ -377,7 +377,7 @@ class Blob_Download_User_Scenario(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         # since the wildcards '*' exists at the end of dir_name in the sas
@@ -397,7 +397,7 @@ class Blob_Download_User_Scenario(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         # since the wildcards '*' exists at the end of dir_name in the sas
@@ -462,7 +462,7 @@ class Blob_Download_User_Scenario(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         # since entire directory is downloaded
@@ -481,7 +481,7 @@ class Blob_Download_User_Scenario(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         #since only logs sub-directory is downloaded, transfers will be 20
@@ -1,8 +1,7 @@
 import unittest
 import utility as util
 import hashlib
-import os
-import shlex
+import shutil
 import subprocess
 from subprocess import CalledProcessError
 
@@ -22,11 +21,11 @@ class BlobPipingTests(unittest.TestCase):
 
         # upload 1KB file using azcopy
         destination_url = util.get_resource_sas(filename)
-        azcopy_cmd = util.Command("copy").add_arguments(destination_url).add_flags("from-to", "PipeBlob").add_flags("log-level", "DEBUG").string()
+        azcopy_cmd = util.Command("copy").add_arguments(destination_url).add_flags("from-to", "PipeBlob").add_flags("log-level", "DEBUG").argv()
         self.assertTrue(execute_command_with_pipe(azcopy_cmd, source_file_to_pipe=source_file_path))
 
         # downloading the uploaded file
-        azcopy_cmd = util.Command("copy").add_arguments(destination_url).add_flags("from-to", "BlobPipe").add_flags("log-level", "DEBUG").string()
+        azcopy_cmd = util.Command("copy").add_arguments(destination_url).add_flags("from-to", "BlobPipe").add_flags("log-level", "DEBUG").argv()
         destination_file_path = util.test_directory_path + "/test_1kb_blob_piping_download.txt"
         self.assertTrue(execute_command_with_pipe(azcopy_cmd, destination_file_to_pipe=destination_file_path))
 
@@ -50,11 +49,11 @@ class BlobPipingTests(unittest.TestCase):
         # TODO reviewers please note, this used to use a 4MB file, with a 1 KiB block size, but now we don't support block sizes
         #    smaller than 1 MB. I've compensated slightly by changing it to an 8 MB file
         destination_url = util.get_resource_sas(filename)
-        azcopy_cmd = util.Command("copy").add_arguments(destination_url).add_flags("block-size-mb", '1').add_flags("from-to", "PipeBlob").add_flags("log-level", "DEBUG").string()
+        azcopy_cmd = util.Command("copy").add_arguments(destination_url).add_flags("block-size-mb", '1').add_flags("from-to", "PipeBlob").add_flags("log-level", "DEBUG").argv()
         self.assertTrue(execute_command_with_pipe(azcopy_cmd, source_file_to_pipe=source_file_path))
 
         # downloading the uploaded file
-        azcopy_cmd = util.Command("copy").add_arguments(destination_url).add_flags("block-size-mb", '1').add_flags("from-to", "BlobPipe").add_flags("log-level", "DEBUG").string()
+        azcopy_cmd = util.Command("copy").add_arguments(destination_url).add_flags("block-size-mb", '1').add_flags("from-to", "BlobPipe").add_flags("log-level", "DEBUG").argv()
         destination_file_path = util.test_directory_path + "/test_8mb_blob_piping_download.txt"
         self.assertTrue(execute_command_with_pipe(azcopy_cmd, destination_file_to_pipe=destination_file_path))
 
@@ -80,7 +79,7 @@ def execute_command_with_pipe(command, source_file_to_pipe=None, destination_fil
     Run AzCopy either with the a source pipe, or with a destination pipe.
     This way of triggering AzCopy is only for this test suite.
 
-    :param command: the azcopy command to be executed
+    :param command: the azcopy command to be executed, as a list of arguments
     :param source_file_to_pipe: source file if applicable
     :param destination_file_to_pipe: destination file if applicable
     :return: bool(successful or not)
@@ -89,18 +88,22 @@ def execute_command_with_pipe(command, source_file_to_pipe=None, destination_fil
             (source_file_to_pipe is not None and destination_file_to_pipe is not None):
         raise ValueError("Either source is specified, or destination is specified")
 
-    azcopy_path = os.path.join(util.test_directory_path, util.azcopy_executable_name)
-    command = azcopy_path + " " + command
+    command = [util.azcopy_executable_path] + command
 
     # if piping a file to azcopy's stdin
     if source_file_to_pipe is not None:
-        try:
-            ps = subprocess.Popen(('cat', source_file_to_pipe), stdout=subprocess.PIPE)
-            subprocess.check_output(shlex.split(command), stdin=ps.stdout, timeout=360)
-            ps.wait(360)
-            return True
-        except CalledProcessError:
-            return False
+        # azcopy only reads from stdin when it is a pipe, so the file is fed through one rather than handed over directly
+        with open(source_file_to_pipe, "rb") as source:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+            try:
+                shutil.copyfileobj(source, process.stdin)
+                process.stdin.close()
+                return process.wait(timeout=360) == 0
+            except (OSError, subprocess.TimeoutExpired):
+                # azcopy exited before reading all of its input, or did not finish in time
+                process.kill()
+                process.wait()
+                return False
 
     # if piping azcopy's output to a file
     if destination_file_to_pipe is not None:
@@ -108,7 +111,7 @@ def execute_command_with_pipe(command, source_file_to_pipe=None, destination_fil
             # an emtpy file is used as stdin because if None was specified, then the subprocess would
             # inherit the parent's stdin pipe, this is a limitation of the subprocess package
             try:
-                subprocess.check_call(shlex.split(command), stdin=fake_input, stdout=output, timeout=360)
+                subprocess.check_call(command, stdin=fake_input, stdout=output, timeout=360)
                 return True
             except CalledProcessError:
                 return False
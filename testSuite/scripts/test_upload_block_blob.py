@@ -3,7 +3,7 @@ import os
 import unittest
 import shutil
 import time
-from collections import namedtuple
+from types import SimpleNamespace
 from stat import *
 import utility as util
 
@@ -276,7 +276,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         # parsing the json and comparing the number of failed and successful transfers.
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersSkipped, "20")
@@ -313,7 +313,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         # Number of failed transfers should be 20 and number of successful transfer should be 20.
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in json format')
         self.assertEquals(x.TransfersCompleted, "20")
@@ -358,7 +358,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
                                                                                  "json").execute_azcopy_copy_command_get_output()
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('erorr parsing the output in Json Format')
         # Since all files exists locally and overwrite flag is set to false, all 20 transfers will be skipped
@@ -381,7 +381,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
                                                                                  "json").execute_azcopy_copy_command_get_output()
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersSkipped, "15")
@@ -407,7 +407,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         # parsing the json and comparing the number of failed and successful transfers.
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersSkipped, "20")
@@ -428,7 +428,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         # parsing the json and comparing the number of failed and successful transfers.
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersSkipped, "0")
@@ -459,7 +459,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         # parsing the json and comparing the number of failed and successful transfers.
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersSkipped, "0")
@@ -476,7 +476,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         # parsing the json and comparing the number of failed and successful transfers.
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersSkipped, "20")
@@ -497,7 +497,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         # parsing the json and comparing the number of failed and successful transfers.
         result = util.parseAzcopyOutput(result)
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersSkipped, "0")
@@ -523,7 +523,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         # parse the Json Output
         try:
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing output in Json format')
         # Number of successful transfer should be 4 and there should be not a failed transfer
@@ -539,7 +539,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         # Number of successful transfer should be 10 and there should be not failed transfer
@@ -566,7 +566,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         # Number of successful transfer should be 16 and there should be not failed transfer
@@ -584,7 +584,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
 
@@ -625,7 +625,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersCompleted, "6")
@@ -642,7 +642,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersCompleted, "10")
@@ -679,7 +679,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in JSON Format')
         # Number of expected successful transfer should be 18 since two files in directory are set to exclude
@@ -697,7 +697,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
 
@@ -743,7 +743,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersCompleted, "10")
@@ -759,7 +759,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
 
@@ -780,7 +780,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
         self.assertEquals(x.TransfersCompleted, "1")
@@ -801,7 +801,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
         result = util.parseAzcopyOutput(result)
         try:
             # parse the Json Output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in Json Format')
 
@@ -829,7 +829,7 @@ class Block_Upload_User_Scenarios(unittest.TestCase):
 
         try:
             # parse the JSON output
-            x = json.loads(result, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            x = json.loads(result, object_hook=lambda d: SimpleNamespace(**d))
         except:
             self.fail('error parsing the output in JSON format')
 
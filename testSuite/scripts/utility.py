@@ -1,14 +1,27 @@
-import ctypes
+import concurrent.futures
 import os
-import platform
 import shutil
+import secrets
+import signal
 import subprocess
-import shlex
-import uuid
-import random
+import sys
 import json
-from pathlib import Path
-from collections import namedtuple
+
+# test files are written in blocks of 1MB, the file buffer is sized to match
+# so that every block is handed to the OS in a single write.
+TEST_FILE_BLOCK_SIZE = 1024 * 1024
+# content of a test file block, built once and shared by every file written.
+TEST_FILE_BLOCK = b'0' * TEST_FILE_BLOCK_SIZE
+# slicing the view shares the block's memory, so partial blocks are written without allocating a copy.
+TEST_FILE_BLOCK_VIEW = memoryview(TEST_FILE_BLOCK)
+# on windows the azcopy and validator processes are started without a console window of their own,
+# their output is captured by the test suite anyway. the flag does not exist on other platforms.
+SUBPROCESS_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+# content of the html test file, identical for every test case.
+TEST_HTML_CONTENT = b"""<html>
+                    <head></head>
+                        <body><p>Hello World!</p></body>
+                </html>"""
 
 
 # Command Class is used to create azcopy commands and validator commands.
@@ -47,58 +60,52 @@ class Command(object):
         self.flags[flag] = value
         return self
 
-    # returns the command by combining arguments and flags.
-    def string(self):
-        command = self.command_type
-        if len(self.args) > 0:
-            for arg in self.args:
-                if (len(arg) > 0):
-                    # add '"' at start and end of each argument.
-                    command += " " + '"' + arg + '"'
-            # iterating through all the values in dict and combining them.
-        if len(self.flags) > 0:
-            for key, value in self.flags.items():
-                command += " --" + key + "=" + '"' + str(value) + '"'
-        return command
+    # returns the command as a list of arguments, so that it can be executed without going through a shell.
+    # empty arguments are skipped.
+    def argv(self):
+        argv = [self.command_type]
+        argv.extend(arg for arg in self.args if len(arg) > 0)
+        argv.extend("--" + key + "=" + str(value) for key, value in self.flags.items())
+        return argv
 
     # this api is used to execute a azcopy copy command.
     # by default, command execute a upload command.
     # return true or false for success or failure of command.
     def execute_azcopy_copy_command(self):
-        return execute_azcopy_command(self.string())
+        return execute_azcopy_command(self.argv())
 
     # this api is used to execute a azcopy copy command.
     # by default, command execute a upload command.
     # return azcopy console output on successful execution.
     def execute_azcopy_copy_command_get_output(self):
-        return execute_azcopy_command_get_output(self.string())
+        return execute_azcopy_command_get_output(self.argv())
 
     def execute_azcopy_command_interactive(self):
-        return execute_azcopy_command_interactive(self.string())
+        return execute_azcopy_command_interactive(self.argv())
 
     # api execute other azcopy commands like cancel, pause, resume or list.
     def execute_azcopy_operation_get_output(self):
-        return execute_azcopy_command_get_output(self.string())
+        return execute_azcopy_command_get_output(self.argv())
 
     # api executes the azcopy validator to verify the azcopy operation.
     def execute_azcopy_verify(self):
-        return verify_operation(self.string())
+        return verify_operation(self.argv())
 
     # api executes the clean command to delete the blob/container/file/share contents.
     def execute_azcopy_clean(self):
-        return verify_operation(self.string())
+        return verify_operation(self.argv())
 
     # api executes the create command to create the blob/container/file/share/directory contents.
     def execute_azcopy_create(self):
-        return verify_operation(self.string())
+        return verify_operation(self.argv())
 
     # api executes the info command to get AzCopy binary embedded infos.
     def execute_azcopy_info(self):
-        return verify_operation_get_output(self.string())
+        return verify_operation_get_output(self.argv())
 
     # api executes the testSuite's upload command to upload(prepare) data to source URL.
     def execute_testsuite_upload(self):
-        return verify_operation(self.string())
+        return verify_operation(self.argv())
 
 # processes oauth command according to swtiches
 def process_oauth_command(
@@ -107,62 +114,52 @@ def process_oauth_command(
     if fromTo!="":
         cmd.add_flags("from-to", fromTo)
 
-# api executes the clean command on validator which deletes all the contents of the container.
-def clean_test_container(container):
-    # execute the clean command.
-    result = Command("clean").add_arguments(container).add_flags("serviceType", "Blob").add_flags("resourceType", "Bucket").execute_azcopy_clean()
+# serviceType, resourceType and the description used in the error message for each kind of resource cleaned by the validator.
+CLEAN_SPECS = {
+    'container': ("Blob", "Bucket", "the container. please check the container sas provided"),
+    'blob_account': ("Blob", "Account", "the blob account. please check the account sas provided"),
+    's3_account': ("S3", "Account", "the S3 account."),
+    'gcp_account': ("GCP", "Account", "the GCP account."),
+    'file_account': ("File", "Account", "the file account. please check the account sas provided"),
+    'share': ("File", "Bucket", "the share. please check the share sas provided"),
+    'filesystem': ("BlobFS", "Bucket", "the filesystem. please check the filesystem URL, user and key provided"),
+}
+
+# api executes the clean command on validator which deletes all the contents of the given resource.
+def clean_test_resource(kind, url):
+    service_type, resource_type, description = CLEAN_SPECS[kind]
+    result = Command("clean").add_arguments(url).add_flags("serviceType", service_type).add_flags("resourceType", resource_type).execute_azcopy_clean()
     if not result:
-        print("error cleaning the container. please check the container sas provided")
+        print("error cleaning " + description)
         return False
     return True
 
+# api executes the clean command on validator which deletes all the contents of the container.
+def clean_test_container(container):
+    return clean_test_resource('container', container)
+
 def clean_test_blob_account(account):
-    result = Command("clean").add_arguments(account).add_flags("serviceType", "Blob").add_flags("resourceType", "Account").execute_azcopy_clean()
-    if not result:
-        print("error cleaning the blob account. please check the account sas provided")
-        return False
-    return True
+    return clean_test_resource('blob_account', account)
 
 def clean_test_s3_account(account):
     if 'S3_TESTS_OFF' in os.environ and os.environ['S3_TESTS_OFF'] != "":
         return True
-    result = Command("clean").add_arguments(account).add_flags("serviceType", "S3").add_flags("resourceType", "Account").execute_azcopy_clean()
-    if not result:
-        print("error cleaning the S3 account.")
-        return False
-    return True
+    return clean_test_resource('s3_account', account)
 
 def clean_test_gcp_account(account):
     if 'GCP_TESTS_OFF' in os.environ and os.environ['GCP_TESTS_OFF'] != "":
         return True
-    result = Command("clean").add_arguments(account).add_flags("serviceType", "GCP").add_flags("resourceType", "Account").execute_azcopy_clean()
-    if not result:
-        print("error cleaning the GCP account.")
-        return False
-    return True
+    return clean_test_resource('gcp_account', account)
 
 def clean_test_file_account(account):
-    result = Command("clean").add_arguments(account).add_flags("serviceType", "File").add_flags("resourceType", "Account").execute_azcopy_clean()
-    if not result:
-        print("error cleaning the file account. please check the account sas provided")
-        return False
-    return True
+    return clean_test_resource('file_account', account)
 
-# api executes the clean command on validator which deletes all the contents of the container.
+# api executes the clean command on validator which deletes all the contents of the share.
 def clean_test_share(shareURLStr):
-    # execute the clean command.
-    result = Command("clean").add_arguments(shareURLStr).add_flags("serviceType", "File").add_flags("resourceType", "Bucket").execute_azcopy_clean()
-    if not result:
-        print("error cleaning the share. please check the share sas provided")
-        return False
-    return True
+    return clean_test_resource('share', shareURLStr)
 
 def clean_test_filesystem(fileSystemURLStr):
-    result = Command("clean").add_arguments(fileSystemURLStr).add_flags("serviceType", "BlobFS").add_flags("resourceType", "Bucket").execute_azcopy_clean()
-    if not result:
-        print("error cleaning the filesystem. please check the filesystem URL, user and key provided")
-        return False
-    return True
+    return clean_test_resource('filesystem', fileSystemURLStr)
 
 # initialize_test_suite initializes the setup for executing test cases.
 def initialize_test_suite(test_dir_path, container_sas, container_oauth, container_oauth_validate, share_sas_url, premium_container_sas, filesystem_url, filesystem_sas_url,
@@ -174,6 +171,12 @@ def initialize_test_suite(test_dir_path, container_sas, container_oauth, contain
     # test_container_url is a global variable used in the entire testSuite holding the user given container shared access signature.
     # all files / directory are uploaded and downloaded to and from this container.
     global test_container_url
+    # the sas urls below are split once around the shared access signature, to build the urls of their resources.
+    global test_container_url_parts
+    global test_oauth_container_validate_sas_url_parts
+    global test_premium_account_contaier_url_parts
+    global test_share_url_parts
+    global test_bfs_sas_account_url_parts
 
     # test_oauth_container_url is a global variable used in the entire testSuite holding the user given container for oAuth testing.
     # all files / directory are uploaded and downloaded to and from this container.
@@ -189,11 +192,9 @@ def initialize_test_suite(test_dir_path, container_sas, container_oauth, contain
     # all files / directory are uploaded and downloaded to and from this share.
     global test_share_url
 
-    # holds the name of the azcopy executable
-    global azcopy_executable_name
-
-    # holds the name of the test suite executable
-    global test_suite_executable_name
+    # hold the full paths of the azcopy and test suite executables staged inside the test directory
+    global azcopy_executable_path
+    global test_suite_executable_path
 
     # holds the filesystem url to perform the operations for blob fs service
     global test_bfs_account_url
@@ -209,30 +210,23 @@ def initialize_test_suite(test_dir_path, container_sas, container_oauth, contain
     # creating a test_directory in the location given by user.
     # this directory will be used to created and download all the test files.
     new_dir_path = os.path.join(test_dir_path, "test_data")
-    # todo finally
-    try:
-        # removing the directory and its contents, if directory exists
-        shutil.rmtree(new_dir_path)
-        os.mkdir(new_dir_path)
-    except:
-        os.mkdir(new_dir_path)
+    # removing the contents of the directory, if directory exists
+    reset_dir(new_dir_path)
+
+    # azcopy is invoked once per operation by the test cases, skip its check for a newer version on each invocation.
+    # the environment is inherited by every azcopy process started by the test suite.
+    os.environ.setdefault("AZCOPY_SKIP_VERSION_CHECK", "true")
 
-    # copying the azcopy executable to the newly created test directory.
-    # this copying is done to avoid using the executables at location which might be used by the user
-    # while test suite is running.
+    # staging the azcopy executable in the newly created test directory.
     if os.path.isfile(azcopy_exec_location):
-        shutil.copy2(azcopy_exec_location, new_dir_path)
-        azcopy_executable_name = parse_out_executable_name(azcopy_exec_location)
+        azcopy_executable_path = stage_executable(azcopy_exec_location, new_dir_path)
     else:
         print("please verify the azcopy executable location")
         return False
 
-    # copying the test executable to the newly created test directory.
-    # this copying is done to avoid using the executables at location which might be used by the user
-    # while test suite is running.
+    # staging the test executable in the newly created test directory.
     if os.path.isfile(test_suite_exec_location):
-        shutil.copy2(test_suite_exec_location, new_dir_path)
-        test_suite_executable_name = parse_out_executable_name(test_suite_exec_location)
+        test_suite_executable_path = stage_executable(test_suite_exec_location, new_dir_path)
     else:
         print("please verify the test suite executable location")
         return False
@@ -240,20 +234,25 @@ def initialize_test_suite(test_dir_path, container_sas, container_oauth, contain
     test_directory_path = new_dir_path
     test_bfs_account_url = filesystem_url
     test_bfs_sas_account_url = filesystem_sas_url
-    if not (test_bfs_account_url.endswith("/") and test_bfs_account_url.endswith("\\")):
+    test_bfs_sas_account_url_parts = split_sas_url(test_bfs_sas_account_url)
+    if not test_bfs_account_url.endswith(("/", "\\")):
         test_bfs_account_url = test_bfs_account_url + "/"
     test_container_url = container_sas
+    test_container_url_parts = split_sas_url(test_container_url)
     test_oauth_container_url = container_oauth
-    if not (test_oauth_container_url.endswith("/") and test_oauth_container_url.endwith("\\")):
+    if not test_oauth_container_url.endswith(("/", "\\")):
         test_oauth_container_url = test_oauth_container_url + "/"
     test_oauth_container_validate_sas_url = container_oauth_validate
+    test_oauth_container_validate_sas_url_parts = split_sas_url(test_oauth_container_validate_sas_url)
     test_premium_account_contaier_url = premium_container_sas
+    test_premium_account_contaier_url_parts = split_sas_url(test_premium_account_contaier_url)
     test_s2s_src_blob_account_url = s2s_src_blob_account_url
     test_s2s_src_file_account_url = s2s_src_file_account_url
     test_s2s_dst_blob_account_url = s2s_dst_blob_account_url
     test_s2s_src_s3_service_url = s2s_src_s3_service_url
     test_s2s_src_gcp_service_url = s2s_src_gcp_service_url
     test_share_url = share_sas_url
+    test_share_url_parts = split_sas_url(test_share_url)
 
     if not clean_test_filesystem(test_bfs_account_url.rstrip("/").rstrip("\\")):  # rstrip because clean fails if trailing /
         print("failed to clean test filesystem.")
@@ -261,8 +260,6 @@ def initialize_test_suite(test_dir_path, container_sas, container_oauth, contain
         print("failed to clean test blob container.")
     if not clean_test_container(test_oauth_container_url):
         print("failed to clean OAuth test blob container.")
-    if not clean_test_container(test_oauth_container_url):
-        print("failed to clean OAuth container.")
     if not clean_test_container(test_premium_account_contaier_url):
         print("failed to clean premium container.")
     if not clean_test_blob_account(test_s2s_src_blob_account_url):
@@ -294,11 +291,9 @@ def initialize_interactive_test_suite(test_dir_path, container_oauth, container_
     # test_container_oauth_validate_sas_url is same container as test_oauth_container_url, while for validation purpose. 
     global test_oauth_container_validate_sas_url
 
-    # holds the name of the azcopy executable
-    global azcopy_executable_name
-
-    # holds the name of the test suite executable
-    global test_suite_executable_name
+    # hold the full paths of the azcopy and test suite executables staged inside the test directory
+    global azcopy_executable_path
+    global test_suite_executable_path
 
     # holds the filesystem url to perform the operations for blob fs service
     global test_bfs_account_url
@@ -309,33 +304,29 @@ def initialize_interactive_test_suite(test_dir_path, container_oauth, container_
     # holds the oauth aad encpoint
     global test_oauth_aad_endpoint
 
+    # holds the validate container url split around the shared access signature.
+    global test_oauth_container_validate_sas_url_parts
+
     # creating a test_directory in the location given by user.
     # this directory will be used to created and download all the test files.
     new_dir_path = os.path.join(test_dir_path, "test_data")
-    # todo finally
-    try:
-        # removing the directory and its contents, if directory exists
-        shutil.rmtree(new_dir_path)
-        os.mkdir(new_dir_path)
-    except:
-        os.mkdir(new_dir_path)
+    # removing the contents of the directory, if directory exists
+    reset_dir(new_dir_path)
 
-    # copying the azcopy executable to the newly created test directory.
-    # this copying is done to avoid using the executables at location which might be used by the user
-    # while test suite is running.
+    # azcopy is invoked once per operation by the test cases, skip its check for a newer version on each invocation.
+    # the environment is inherited by every azcopy process started by the test suite.
+    os.environ.setdefault("AZCOPY_SKIP_VERSION_CHECK", "true")
+
+    # staging the azcopy executable in the newly created test directory.
     if os.path.isfile(azcopy_exec_location):
-        shutil.copy2(azcopy_exec_location, new_dir_path)
-        azcopy_executable_name = parse_out_executable_name(azcopy_exec_location)
+        azcopy_executable_path = stage_executable(azcopy_exec_location, new_dir_path)
     else:
         print("please verify the azcopy executable location")
         return False
 
-    # copying the test executable to the newly created test directory.
-    # this copying is done to avoid using the executables at location which might be used by the user
-    # while test suite is running.
+    # staging the test executable in the newly created test directory.
     if os.path.isfile(test_suite_exec_location):
-        shutil.copy2(test_suite_exec_location, new_dir_path)
-        test_suite_executable_name = parse_out_executable_name(test_suite_exec_location)
+        test_suite_executable_path = stage_executable(test_suite_exec_location, new_dir_path)
     else:
         print("please verify the test suite executable location")
         return False
@@ -349,68 +340,135 @@ def initialize_interactive_test_suite(test_dir_path, container_oauth, container_
     test_bfs_account_url = filesystem_url
     if not clean_test_filesystem(test_bfs_account_url):
         return False
-    if not (test_bfs_account_url.endswith("/") and test_bfs_account_url.endwith("\\")):
+    if not test_bfs_account_url.endswith(("/", "\\")):
         test_bfs_account_url = test_bfs_account_url + "/"
 
     test_oauth_container_url = container_oauth
-    if not (test_oauth_container_url.endswith("/") and test_oauth_container_url.endwith("\\")):
+    if not test_oauth_container_url.endswith(("/", "\\")):
         test_oauth_container_url = test_oauth_container_url + "/"
     
     # as validate container URL point to same URL as oauth container URL, do clean up with validate container URL
     test_oauth_container_validate_sas_url = container_oauth_validate
+    test_oauth_container_validate_sas_url_parts = split_sas_url(test_oauth_container_validate_sas_url)
     if not clean_test_container(test_oauth_container_validate_sas_url):
         return False
 
     return True
 
 
+# split_sas_url splits the given url at its shared access signature, returning the resource url and the signature.
+# the signature itself never contains an unescaped '?', so the url is only split at the first one.
+def split_sas_url(url_with_sas):
+    return url_with_sas.split("?", 1)
+
+# reset_dir leaves an empty directory at dir_path, creating it if needed.
+# an existing directory is kept and only its entries are removed, files are unlinked directly
+# and only sub directories go through rmtree.
+# entries that are already gone are skipped, any other failure is raised since leftover files
+# would change what the test cases transfer.
+def reset_dir(dir_path):
+    try:
+        entries = os.scandir(dir_path)
+    except FileNotFoundError:
+        os.makedirs(dir_path, exist_ok=True)
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
 # given a path, parse out the name of the executable
 def parse_out_executable_name(full_path):
     head, tail = os.path.split(full_path)
     return tail
 
+# stage_executable makes the given executable available inside the test directory, so that all the
+# test cases invoke it from the same location.
+# a symbolic link is created instead of copying the executable, which can be tens of MB.
+# if the link cannot be created (e.g. on Windows without the symlink privilege), the executable is copied.
+def stage_executable(exec_location, dir_path):
+    staged_path = os.path.join(dir_path, parse_out_executable_name(exec_location))
+    try:
+        os.symlink(os.path.abspath(exec_location), staged_path)
+        return staged_path
+    except (OSError, NotImplementedError):
+        pass
+    # symbolic links need extra privileges on windows, a hard link does not when on the same volume.
+    try:
+        os.link(exec_location, staged_path)
+    except OSError:
+        copy_executable(exec_location, staged_path)
+    return staged_path
+
+# copy_executable copies the executable at src_path to dst_path, preserving its permission bits.
+# the staged copy only lives until the next run, so its timestamps are not carried over.
+# where available the data is copied inside the kernel with copy_file_range, without passing through user space.
+def copy_executable(src_path, dst_path):
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(src_path, dst_path)
+        shutil.copymode(src_path, dst_path)
+        return
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    # the kernel stopped short of the expected size, e.g. the file shrank or the
+                    # file system copies nothing this way, so the rest goes through user space.
+                    shutil.copyfileobj(src, dst)
+                    break
+                remaining = remaining - copied
+        except OSError:
+            # the file system does not support copy_file_range, so copying the rest through user space.
+            shutil.copyfileobj(src, dst)
+    shutil.copymode(src_path, dst_path)
+
+# write_test_file_content writes size bytes of test content to the given file opened in binary mode.
+def write_test_file_content(f, size):
+    # since size of file can very large and size variable can overflow while holding the file size
+    # file is written in blocks of 1MB, all of them sharing the same pre-built block.
+    # where supported, the blocks of a large file are allocated by a single call up front.
+    if size >= TEST_FILE_BLOCK_SIZE and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError:
+            pass
+    total_size = size
+    while total_size >= TEST_FILE_BLOCK_SIZE:
+        f.write(TEST_FILE_BLOCK)
+        total_size = total_size - TEST_FILE_BLOCK_SIZE
+    if total_size > 0:
+        f.write(TEST_FILE_BLOCK_VIEW[:total_size])
+
 # todo : find better way
 # create_test_file creates a file with given file name and of given size inside the test directory.
 # returns the local file path.
 def create_test_file(filename, size):
     # creating the file path
     file_path = os.path.join(test_directory_path, filename)
-    # if file already exists, then removing the file.
-    if os.path.isfile(file_path):
-        os.remove(file_path)
-    f = open(file_path, 'w')
-    # since size of file can very large and size variable can overflow while holding the file size
-    # file is written in blocks of 1MB.
-    if size > 1024 * 1024:
-        total_size = size
-        while total_size > 0:
-            num_chars = 1024 * 1024
-            if total_size < num_chars:
-                num_chars = total_size
-            f.write('0' * num_chars)
-            total_size = total_size - num_chars
-    else:
-        num_chars = size
-        f.write('0' * num_chars)
-    f.close()
+    # if file already exists, opening it for writing truncates it.
+    with open(file_path, 'wb', buffering=TEST_FILE_BLOCK_SIZE) as f:
+        write_test_file_content(f, size)
     return file_path
 
 def create_json_file(filename, jsonData):
     # creating the file path
     file_path = os.path.join(test_directory_path, filename + ".json")
-    # if file already exists, then removing the file.
-    if os.path.isfile(file_path):
-        os.remove(file_path)
+    # if file already exists, opening it for writing truncates it.
     with open(file_path, 'w') as outfile:
         json.dump(jsonData, outfile)
-    outfile.close()
     return file_path
 
 def create_new_list_of_files(filename, list):
     # creating the file path
     file_path = os.path.join(test_directory_path, filename + ".txt")
-    if os.path.isfile(file_path):
-        os.remove(file_path)
+    # if file already exists, opening it for writing truncates it.
     with open(file_path, 'w') as outfile:
         outfile.writelines(list)
     outfile.close()
@@ -421,28 +479,18 @@ def create_new_list_of_files(filename, list):
 def create_test_html_file(filename):
     # creating the file path
     file_path = os.path.join(test_directory_path, filename)
-    # if file already exists, then removing the file.
-    if os.path.isfile(file_path):
-        os.remove(file_path)
-
-    f = open(file_path, 'w')
-    message = """<html>
-                    <head></head>
-                        <body><p>Hello World!</p></body>
-                </html>"""
-    f.write(message)
-    f.close()
+    # if file already exists, opening it for writing truncates it.
+    with open(file_path, 'wb') as f:
+        f.write(TEST_HTML_CONTENT)
     return file_path
 
 
 # creates a dir with given inside test directory
 def create_test_dir(dir_name):
-    # If the directory exists, remove it.
+    # If the directory exists, remove its contents.
     dir_path = os.path.join(test_directory_path, dir_name)
-    if os.path.isdir(dir_path):
-        shutil.rmtree(dir_path)
     try:
-        os.mkdir(dir_path)
+        reset_dir(dir_path)
     except:
         raise Exception("error creating directory ", dir_path)
     return dir_path
@@ -454,36 +502,27 @@ def create_test_dir(dir_name):
 def create_test_n_files(size, n, dir_name):
     # creating directory inside test directory.
     dir_n_files_path = os.path.join(test_directory_path, dir_name)
-    try:
-        shutil.rmtree(dir_n_files_path)
-        os.mkdir(dir_n_files_path)
-    except:
-        os.mkdir(dir_n_files_path)
+    reset_dir(dir_n_files_path)
     # creating file prefix
     filesprefix = "test" + str(n) + str(size)
-    # creating n files.
-    for index in range(0, n):
+    # creating a single file of the batch.
+    def create_nth_file(index):
         filename = filesprefix + '_' + str(index) + ".txt"
         # creating the file path
         file_path = os.path.join(dir_n_files_path, filename)
-        # if file already exists, then removing the file.
-        if os.path.isfile(file_path):
-            os.remove(file_path)
-        f = open(file_path, 'w')
-        # since size of file can very large and size variable can overflow while holding the file size
-        # file is written in blocks of 1MB.
-        if size > 1024 * 1024:
-            total_size = size
-            while total_size > 0:
-                num_chars = 1024 * 1024
-                if total_size < num_chars:
-                    num_chars = total_size
-                f.write('0' * num_chars)
-                total_size = total_size - num_chars
-        else:
-            num_chars = size
-            f.write('0' * num_chars)
-        f.close()
+        with open(file_path, 'wb', buffering=TEST_FILE_BLOCK_SIZE) as f:
+            write_test_file_content(f, size)
+
+    # creating n files.
+    # file creation is dominated by open / write / close calls which release the GIL,
+    # so the files are created concurrently, with no more workers than files to create.
+    max_workers = min(n, 32, (os.cpu_count() or 1) * 4)
+    if max_workers <= 1:
+        for index in range(0, n):
+            create_nth_file(index)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(create_nth_file, range(0, n)))
     return dir_n_files_path
 
 
@@ -491,9 +530,10 @@ def create_test_n_files(size, n, dir_name):
 # test the page blob operations of azcopy
 def create_complete_sparse_file(filename, filesize):
     file_path = os.path.join(test_directory_path, filename)
-    sparse = Path(file_path)
-    sparse.touch()
-    os.truncate(str(sparse), filesize)
+    # the file is truncated to zero and then extended to the given size through the same handle,
+    # so no data is written and any previous content is discarded.
+    with open(file_path, 'wb') as f:
+        f.truncate(filesize)
     return file_path
 
 
@@ -503,59 +543,75 @@ def create_complete_sparse_file(filename, filesize):
 # return the local file path of created file.
 def create_partial_sparse_file(filename, filesize):
     file_path = os.path.join(test_directory_path, filename)
-    if os.path.isfile(file_path):
-        os.remove(file_path)
-    f = open(file_path, 'w')
-    # file size is less than 8MB or given size is not multiple of 8MB,
-    # no file is created.
-    if filesize < 8 * 1024 * 1024 or filesize % (8 * 1024 * 1024) != 0:
-        return None
-    else:
+    # if file already exists, opening it for writing truncates it.
+    with open(file_path, 'wb') as f:
+        # file size is less than 8MB or given size is not multiple of 8MB,
+        # no file is created.
+        if filesize < 8 * 1024 * 1024 or filesize % (8 * 1024 * 1024) != 0:
+            return None
         total_size = filesize
         while total_size > 0:
             num_chars = 4 * 1024 * 1024
-            f.write('0' * num_chars)
+            # the data regions reuse the shared test file block rather than building a 4MB string per region.
+            for _ in range(num_chars // TEST_FILE_BLOCK_SIZE):
+                f.write(TEST_FILE_BLOCK)
             total_size = total_size - num_chars
             if total_size <= 0:
                 break
-            f.write('\0' * num_chars)
+            # the zero regions are skipped over instead of written, leaving holes in the file.
+            f.seek(num_chars, os.SEEK_CUR)
             total_size = total_size - num_chars
+        # a trailing hole is only part of the file once its length is set.
+        f.truncate(filesize)
     return file_path
 
 
-# execute_azcopy_command executes the given azcopy command.
+# run_command runs the given list of arguments to completion and returns the subprocess.CompletedProcess.
+# on posix the command gets its own process group, so that when it runs past the timeout the whole group,
+# including any process it started, is killed and reaped before subprocess.TimeoutExpired is raised.
+def run_command(argv, timeout, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=False):
+    with subprocess.Popen(argv, stdout=stdout, stderr=stderr, universal_newlines=universal_newlines,
+                          creationflags=SUBPROCESS_CREATION_FLAGS, start_new_session=(os.name == "posix")) as process:
+        try:
+            output, errors = process.communicate(timeout=timeout)
+        except:
+            try:
+                if os.name == "posix":
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+            except ProcessLookupError:
+                # the command exited on its own in the meantime.
+                pass
+            process.communicate()
+            raise
+    return subprocess.CompletedProcess(argv, process.returncode, output, errors)
+
+# execute_azcopy_command executes the given azcopy command, given as a list of arguments.
 # returns true / false on success / failure of command.
 def execute_azcopy_command(command):
-    # azcopy executable path location.
-    azspath = os.path.join(test_directory_path, azcopy_executable_name)
-    cmnd = azspath + " " + command
+    cmnd = [azcopy_executable_path] + command
 
+    # executing the command with timeout to set 3 minutes / 360 sec.
+    # the output is only looked at when the command fails, so it is decoded on that path only.
     try:
-        # executing the command with timeout to set 3 minutes / 360 sec.
-        subprocess.check_output(
-            cmnd, stderr=subprocess.STDOUT, shell=True, timeout=360,
-            universal_newlines=True)
-    except subprocess.CalledProcessError as exec:
-        # todo kill azcopy command in case of timeout
-        print("command failed with error code " , exec.returncode , " and message " + exec.output)
+        result = run_command(cmnd, timeout=360)
+    except subprocess.TimeoutExpired:
+        print("command timed out and was killed")
         return False
-    else:
-        return True
+    if result.returncode != 0:
+        print("command failed with error code " , result.returncode , " and message " + result.stdout.decode('utf-8', 'replace'))
+        return False
+    return True
 
 # execute_azcopy_command_interactive executes the given azcopy command in "inproc" mode.
 # returns azcopy console output or none on success / failure of command.
 def execute_azcopy_command_interactive(command):
-    # azcopy executable path location concatenated with inproc keyword.
-    azspath = os.path.join(test_directory_path, azcopy_executable_name)
-    cmnd = azspath + " " + command
-    if os.name == "nt":
-        process = subprocess.Popen(cmnd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-    else:
-        process = subprocess.Popen(shlex.split(cmnd), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-    for line in iter(process.stdout.readline, b''):
-        print(line.decode('utf-8'))
-    process.wait()
-    if process.poll() == 0:
+    cmnd = [azcopy_executable_path] + command
+    # the command inherits the console, so its output (e.g. the device login prompt) is shown as soon as it
+    # is written, without azcopy stalling on a pipe drained line by line.
+    process = subprocess.Popen(cmnd)
+    if process.wait() == 0:
         return True
     else:
         return False
@@ -564,54 +620,30 @@ def execute_azcopy_command_interactive(command):
 # execute_azcopy_command_get_output executes the given azcopy command in "inproc" mode.
 # returns azcopy console output or none on success / failure of command.
 def execute_azcopy_command_get_output(command):
-    # azcopy executable path location concatenated with inproc keyword.
-    azspath = os.path.join(test_directory_path, azcopy_executable_name)
-    cmnd = azspath + " " + command
-    output = ""
-    try:
-        # executing the command with timeout set to 6 minutes / 360 sec.
-        output = subprocess.check_output(
-            cmnd, stderr=subprocess.STDOUT, shell=True, timeout=360,
-            universal_newlines=True)
-    except subprocess.CalledProcessError as exec:
-        # print("command failed with error code ", exec.returncode, " and message " + exec.output)
-        return exec.output
-    else:
-        return output
+    cmnd = [azcopy_executable_path] + command
+    # executing the command with timeout set to 6 minutes / 360 sec.
+    # the output is returned whether the command succeeds or fails.
+    result = run_command(cmnd, timeout=360, universal_newlines=True)
+    return result.stdout
 
 
 # verify_operation executes the validator command to verify the azcopy operations.
 # return true / false on success / failure of command.
 def verify_operation(command):
-    # testSuite executable local path inside the test directory.
-    test_suite_path = os.path.join(test_directory_path, test_suite_executable_name)
-    command = test_suite_path + " " + command
-    try:
-        # executing the command with timeout set to 6 minutes / 360 sec.
-        subprocess.check_output(
-            command, stderr=subprocess.STDOUT, shell=True, timeout=360,
-            universal_newlines=True)
-    except subprocess.CalledProcessError as exec:
-        # print("command failed with error code ", exec.returncode, " and message " + exec.output)
-        return False
-    else:
-        return True
+    command = [test_suite_executable_path] + command
+    # executing the command with timeout set to 6 minutes / 360 sec.
+    # the output is never looked at, so it is discarded by the OS instead of being read into the test suite.
+    result = run_command(command, timeout=360, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result.returncode == 0
 
 # verify_operation_get_output executes the validator command and returns output.
 def verify_operation_get_output(command):
-    # testSuite executable local path inside the test directory.
-    test_suite_path = os.path.join(test_directory_path, test_suite_executable_name)
-    command = test_suite_path + " " + command
-    try:
-        # executing the command with timeout set to 10 minutes / 600 sec.
-        output = subprocess.check_output(
-            command, stderr=subprocess.STDOUT, shell=True, timeout=600,
-            universal_newlines=True)
-    except subprocess.CalledProcessError as exec:
-        #print("command failed with error code ", exec.returncode, " and message " + exec.output)
+    command = [test_suite_executable_path] + command
+    # executing the command with timeout set to 10 minutes / 600 sec.
+    result = run_command(command, timeout=600, universal_newlines=True)
+    if result.returncode != 0:
         return None
-    else:
-        return output
+    return result.stdout
 
 def get_object_sas(url_with_sas, object_name):
     # Splitting the container URL to add the uploaded blob name to the SAS
@@ -636,18 +668,14 @@ def get_object_without_sas(url, object_name):
 # get_resource_sas return the shared access signature for the given resource
 # using the container url.
 def get_resource_sas(resource_name):
-    # Splitting the container URL to add the uploaded blob name to the SAS
-    url_parts = test_container_url.split("?")
+    # the container URL is split once in initialize_test_suite, to add the uploaded blob name to the SAS
     # adding the blob name after the container name
-    resource_sas = url_parts[0] + "/" + resource_name + '?' + url_parts[1]
-    return resource_sas
+    return test_container_url_parts[0] + "/" + resource_name + '?' + test_container_url_parts[1]
 
 def get_resource_from_oauth_container_validate(resource_name):
-    # Splitting the container URL to add the uploaded blob name to the SAS
-    url_parts = test_oauth_container_validate_sas_url.split("?")
+    # the container URL is split once at initialization, to add the uploaded blob name to the SAS
     # adding the blob name after the container name
-    resource_sas = url_parts[0] + "/" + resource_name + '?' + url_parts[1]
-    return resource_sas
+    return test_oauth_container_validate_sas_url_parts[0] + "/" + resource_name + '?' + test_oauth_container_validate_sas_url_parts[1]
 
 def get_resource_from_oauth_container(resource_name):
     return test_oauth_container_url + resource_name
@@ -670,28 +698,22 @@ def append_text_path_resource_sas(resource_sas, text):
 # get_resource_sas_from_share return the shared access signature for the given resource
 # based on the share url.
 def get_resource_sas_from_share(resource_name):
-    # Splitting the share URL to add the file or directory name to the SAS
-    url_parts = test_share_url.split("?")
+    # the share URL is split once in initialize_test_suite, to add the file or directory name to the SAS
     # adding the file or directory name after the share name
-    resource_sas = url_parts[0] + "/" + resource_name + '?' + url_parts[1]
-    return resource_sas
+    return test_share_url_parts[0] + "/" + resource_name + '?' + test_share_url_parts[1]
 
 def get_resource_sas_from_bfs(resource_name):
-    # Splitting the share URL to add the file or directory name to the SAS
-    url_parts = test_bfs_sas_account_url.split("?")
-    # adding the file or directory name after the share name
-    resource_sas = url_parts[0] + "/" + resource_name + '?' + url_parts[1]
-    return resource_sas
+    # the filesystem URL is split once in initialize_test_suite, to add the file or directory name to the SAS
+    # adding the file or directory name after the filesystem name
+    return test_bfs_sas_account_url_parts[0] + "/" + resource_name + '?' + test_bfs_sas_account_url_parts[1]
 
 
 # get_resource_sas return the shared access signature for the given resource
 # using the premium storage account container url.
 def get_resource_sas_from_premium_container_sas(resource_name):
-    # Splitting the container URL to add the uploaded blob name to the SAS
-    url_parts = test_premium_account_contaier_url.split("?")
+    # the container URL is split once in initialize_test_suite, to add the uploaded blob name to the SAS
     # adding the blob name after the container name
-    resource_sas = url_parts[0] + "/" + resource_name + '?' + url_parts[1]
-    return resource_sas
+    return test_premium_account_contaier_url_parts[0] + "/" + resource_name + '?' + test_premium_account_contaier_url_parts[1]
 
 
 # parseAzcopyOutput parses the Azcopy Output in JSON format to give the final Azcopy Output in JSON Format
@@ -700,59 +722,49 @@ def get_resource_sas_from_premium_container_sas(resource_name):
 # parseAzcopyOutput returns the final JobSummary in JSON format.
 def parseAzcopyOutput(s):
     count = 0
-    output = ""
     final_output = ""
-    # Split the lines
-    lines = s.split('\n')
-    # Iterating through the output in reverse order since last summary has to be considered.
+    # Iterating through the output lines in reverse order since last summary has to be considered.
+    # the lines are located with rfind, so the output is neither split nor copied while it is scanned.
     # Increment the count when line is "}"
     # Reduce the count when line is "{"
-    # append the line to final output
     # When the count is 0, it means the last Summary has been traversed
-    for line in reversed(lines):
+    # and the text between the first and the last visited line make up the final output.
+    last_end = -1
+    end = len(s)
+    while end >= 0:
+        start = s.rfind('\n', 0, end) + 1
         # If the line is empty, then continue
-        if line == "":
-            continue
-        elif line == '}':
-            count = count + 1
-        elif line == "{":
-            count = count - 1
-        if count >= 0:
-            if len(output) > 0:
-                output = output + '\n' + line
-            else:
-                output = line
-        if count == 0:
-            break
-    lines = output.split('\n')
-    # Since the lines were iterated in reverse order revering them again and
-    # concatenating the lines to get the final JobSummary
-    for line in reversed(lines):
-        if len(final_output) > 0:
-            final_output = final_output + '\n' + line
-        else:
-            final_output = line
-
-    x = json.loads(final_output, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
-    return x.MessageContent
+        if start < end:
+            if last_end < 0:
+                last_end = end
+            if end - start == 1:
+                if s[start] == '}':
+                    count = count + 1
+                elif s[start] == '{':
+                    count = count - 1
+            if count <= 0:
+                final_output = s[start:last_end]
+                break
+        end = start - 1
+
+    # only the message content is needed, so the json is read as plain dicts.
+    return json.loads(final_output)["MessageContent"]
 
 def get_resource_name(prefix=''):
-    return prefix + str(uuid.uuid4()).replace('-', '')
+    # 32 lowercase hex characters, the same shape as a uuid4 without dashes.
+    return prefix + secrets.token_hex(16)
     
 def get_random_bytes(size):
-    rand = random.Random()
-    result = bytearray(size)
-    for i in range(size):
-        result[i] = int(rand.random()*255)  # random() is consistent between python 2 and 3
-    return bytes(result)
+    # the buffer is filled by the OS in a single call instead of byte by byte.
+    return os.urandom(size)
 
 def create_hidden_file(path, file_name, data):
     FILE_ATTRIBUTE_HIDDEN = 0x02
-    os_type = platform.system()
-    os_type = os_type.upper()
+    # sys.platform is fixed when the interpreter starts, unlike platform.system() it needs no lookup.
+    is_windows = sys.platform == "win32"
 
     # For *nix add a '.' prefix.
-    prefix = '.' if os_type != "WINDOWS" else ''
+    prefix = '.' if not is_windows else ''
     file_name = prefix + file_name
 
     file_path = os.path.join(path, file_name)
@@ -761,7 +773,8 @@ def create_hidden_file(path, file_name, data):
         f.write(data)
 
     # For windows set file attribute.
-    if os_type == "WINDOWS":
+    if is_windows:
+        import ctypes
         ret = ctypes.windll.kernel32.SetFileAttributesW(file_path,
                                                         FILE_ATTRIBUTE_HIDDEN)
         if not ret: # There was an error.
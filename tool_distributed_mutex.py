@@ -15,6 +15,10 @@ from azure.core import (
 LOCK = 'lock'
 UNLOCK = 'unlock'
 
+# bounds of the exponential backoff between attempts to lock the mutex, in seconds
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30
+
 
 def get_raw_input():
     parser = argparse.ArgumentParser(description='Lock/unlock a distributed mutex (implemented with blob lease)')
@@ -36,7 +40,7 @@ def process():
         blob_client.get_blob_properties()
         print("INFO: validated mutex url")
     except HttpResponseError as e:
-        raise ValueError('please provide an existing and valid blob URL, failed to get properties with error: ' + e)
+        raise ValueError('please provide an existing and valid blob URL, failed to get properties with error: ' + str(e))
 
     # get a handle on the lease
     lease_client = LeaseClient(blob_client)
@@ -47,6 +51,7 @@ def process():
         return
 
     # action is lock, attempt to acquire the lease continuously
+    attempt = 0
     while True:
         # try to acquire and infinite lease
         try:
@@ -56,11 +61,18 @@ def process():
             # if we don't get here it stalls forever, as expected
             print(f"INFO: successfully locked the mutex!")
             return
-        except HttpResponseError:
+        except HttpResponseError as e:
+            # only a conflict means that another agent holds the mutex,
+            # any other status (e.g. 403 for an expired SAS, 404 for a missing blob) would never go away by retrying
+            if getattr(e, 'status_code', None) != 409:
+                raise
+
             # failed to acquire lease, another agent holds the mutex
-            # sleep a bit (randomly) and try again
-            sleep_period = random.randint(1, 5)
-            print(f"INFO: failed to lock mutex, wait for {sleep_period} and try again")
+            # sleep a random period up to an exponentially growing bound (full jitter) and try again,
+            # so that waiting agents spread out their attempts instead of retrying together
+            sleep_period = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (1 << min(attempt, 6))))
+            attempt += 1
+            print(f"INFO: failed to lock mutex, wait for {sleep_period:.1f} and try again")
             time.sleep(sleep_period)
 
 
@@ -6,10 +6,20 @@
 # license information.
 # --------------------------------------------------------------------------
 
-from subprocess import check_call
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 import os
 import shutil
+import subprocess
+import tarfile
+import time
+import zipfile
+
+# pgzip is optional, it writes a standard gzip stream while compressing on all the cores
+try:
+    import pgzip
+except ImportError:
+    pgzip = None
 
 DEFAULT_DESTINATION_FOLDER = "./dist"
 DEFAULT_SOURCE_FOLDER = "./"
@@ -19,29 +29,114 @@ THIRD_PARTY_NOTICE_FILE_NAME = "ThirdPartyNotice.txt"
 EXECUTABLES_TO_ZIP = ["azcopy_darwin_amd64", "azcopy_windows_386.exe", "azcopy_windows_amd64.exe"]
 EXECUTABLES_TO_TAR = ["azcopy_linux_amd64"]
 
+# deflate level of the packages, the go executables gain little from the slower levels
+COMPRESSION_LEVEL = 3
 
-def create_directory(dir):
-    os.mkdir(dir)
+# size of the chunks in which the files are copied into the tar stream, rather than tarfile's default of 16KB
+TAR_COPY_BUFFER_SIZE = 1024 * 1024
 
 
-def remove_directory(dir):
-    shutil.rmtree(dir)
-
-
-def copy_file(src, dst):
-    shutil.copy(src, dst)
-
-
-def rename_file(src, dst):
-    shutil.move(src, dst)
+def create_directory(dir):
+    os.mkdir(dir)
 
 
-def tar_dir(dst, src, cwd):
-    check_call(["tar", "--exclude='*.DS_Store'", "-czvf", dst, src], cwd=cwd)
+def remove_entry(entry):
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path)
+    else:
+        os.unlink(entry.path)
 
 
-def zip_dir(dst, src, cwd):
-    check_call(["zip", "-r", "-X", "-x='*.DS_Store'", dst, src], cwd=cwd)
+def remove_directory(dir):
+    # the entries are deleted concurrently, which matters on network shares where every delete is a round trip
+    with os.scandir(dir) as it:
+        entries = list(it)
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(entries)))) as executor:
+        for _ in executor.map(remove_entry, entries):
+            pass
+    os.rmdir(dir)
+
+
+# members is a list of (source path, name in the archive) pairs, all of them inside folder_name.
+# the tarball is opened with dereference so that symlinked inputs are stored with their content, like in the zips.
+def write_tar_members(tar, folder_name, members):
+    folder = tarfile.TarInfo(folder_name)
+    folder.type = tarfile.DIRTYPE
+    folder.mode = 0o755
+    folder.mtime = int(time.time())
+    tar.addfile(folder)
+    for src, arcname in members:
+        tar.add(src, arcname=arcname)
+
+
+def tar_files(dst, folder_name, members):
+    # pigz compresses on all the cores, the tar stream is written into its stdin
+    if shutil.which("pigz") is not None:
+        with open(dst, "wb") as output, \
+                subprocess.Popen(["pigz", "-{}".format(COMPRESSION_LEVEL)], stdin=subprocess.PIPE, stdout=output) as pigz:
+            with tarfile.open(fileobj=pigz.stdin, mode="w|", copybufsize=TAR_COPY_BUFFER_SIZE,
+                              dereference=True) as tar:
+                write_tar_members(tar, folder_name, members)
+        if pigz.returncode != 0:
+            raise subprocess.CalledProcessError(pigz.returncode, pigz.args)
+        return
+
+    if pgzip is not None:
+        with pgzip.open(dst, "wb", compresslevel=COMPRESSION_LEVEL, blocksize=2 * 10 ** 7) as gz, \
+                tarfile.open(fileobj=gz, mode="w|", copybufsize=TAR_COPY_BUFFER_SIZE,
+                             dereference=True) as tar:
+            write_tar_members(tar, folder_name, members)
+        return
+
+    with tarfile.open(dst, "w:gz", compresslevel=COMPRESSION_LEVEL, copybufsize=TAR_COPY_BUFFER_SIZE,
+                      dereference=True) as tar:
+        write_tar_members(tar, folder_name, members)
+
+
+# members is a list of (source path, name in the archive) pairs, all of them inside folder_name
+def zip_files(dst, folder_name, members):
+    with zipfile.ZipFile(dst, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESSION_LEVEL) as archive:
+        folder = zipfile.ZipInfo(folder_name + "/", date_time=time.localtime()[:6])
+        folder.external_attr = (0o40755 << 16) | 0x10  # unix directory mode, and the MS-DOS directory flag
+        archive.writestr(folder, b"")
+        for src, arcname in members:
+            archive.write(src, arcname)
+
+
+# plan_packages lists, for each executable, the standard name it is packaged under,
+# the function writing its archive and the extension of the archive
+def plan_packages():
+    def executable_name(executable):
+        return "azcopy.exe" if executable.endswith(".exe") else "azcopy"
+
+    return [(executable, executable_name(executable), zip_files, ".zip") for executable in EXECUTABLES_TO_ZIP] + \
+           [(executable, executable_name(executable), tar_files, ".tar.gz") for executable in EXECUTABLES_TO_TAR]
+
+
+def scan_input_folder(input_folder, plan):
+    # list the input folder once, instead of looking up the notice again for every package,
+    # and make sure everything needed is there before any package gets written
+    input_entries = {entry.name: entry for entry in os.scandir(input_folder) if entry.is_file()}
+    missing = [name for name in [package[0] for package in plan] + [THIRD_PARTY_NOTICE_FILE_NAME]
+               if name not in input_entries]
+    if missing:
+        raise FileNotFoundError("Missing from the input folder {}: {}".format(input_folder, ", ".join(missing)))
+    return input_entries
+
+
+def package_one(executable, executable_name, archive_files, extension, version, input_entries, output_folder):
+    package_name = "{}_{}".format(executable.replace('.exe', ''), version)
+
+    # the files are archived straight from the input folder under the package folder,
+    # the executable under the standard name, so nothing needs to be staged on disk
+    members = [
+        (input_entries[executable].path, "{}/{}".format(package_name, executable_name)),
+        (input_entries[THIRD_PARTY_NOTICE_FILE_NAME].path,
+         "{}/{}".format(package_name, THIRD_PARTY_NOTICE_FILE_NAME)),
+    ]
+
+    # compress the files accordingly
+    archive_files(os.path.join(output_folder, package_name + extension), package_name, members)
 
 
 if __name__ == "__main__":
@@ -55,38 +150,28 @@ if __name__ == "__main__":
     print("Starting package generation: version={0}, input folder={1}, output folder={2}"
           .format(args.version, args.input_folder, args.output_folder))
 
-    # step 2: delete output folder if present
+    # step 2: check that the input folder has everything the packages need
+    plan = plan_packages()
+    input_entries = scan_input_folder(args.input_folder, plan)
+
+    # step 3: delete output folder if present
     if os.path.exists(args.output_folder):
         print("Deleting existing output folder: " + args.output_folder)
         remove_directory(args.output_folder)
 
-    # step 3: create package for each environment
+    # step 4: create package for each environment
     print("Creating output folder: " + args.output_folder)
     create_directory(args.output_folder)
-    for executable in EXECUTABLES_TO_ZIP + EXECUTABLES_TO_TAR:
-        output_folder_name = "{}_{}".format(executable.replace('.exe', ''), args.version)
-        output_folder_path = os.path.join(args.output_folder, output_folder_name)
-
-        # each executable should be in a different folder
-        create_directory(output_folder_path)
-
-        # copy the executable into the right folder
-        copy_file(os.path.join(args.input_folder, executable), output_folder_path)
-
-        # rename executables to the standard name
-        rename_file(os.path.join(output_folder_path, executable), os.path.join(output_folder_path, "azcopy.exe" if ".exe" in executable else "azcopy"))
-
-        # copy the third party notice over
-        copy_file(os.path.join(args.input_folder, THIRD_PARTY_NOTICE_FILE_NAME), output_folder_path)
-
-        # compress the folder accordingly
-        if executable in EXECUTABLES_TO_TAR:
-            tar_dir("{}.tar.gz".format(output_folder_name), output_folder_name,
-                    cwd=os.path.abspath(args.output_folder))
-        else:
-            zip_dir("{}.zip".format(output_folder_name), output_folder_name,
-                    cwd=os.path.abspath(args.output_folder))
 
-    # step 4: create version file
-    with open(os.path.join(args.output_folder, "latest_version.txt"), "w+") as f:
-        f.write(args.version + "\n")
+    # the packages are independent of each other, and the compression (zlib, or pigz in its own process)
+    # does not hold the GIL, so every package is created on its own thread
+    output_folder = os.path.abspath(args.output_folder)
+    with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+        futures = [executor.submit(package_one, *package, args.version, input_entries, output_folder)
+                   for package in plan]
+        for future in futures:
+            future.result()
+
+    # step 5: create version file
+    with open(os.path.join(args.output_folder, "latest_version.txt"), "wb") as f:
+        f.write((args.version + "\n").encode("ascii"))